@@ -11,7 +11,12 @@ statistics.
 """
 
 
+from collections import defaultdict
 from datetime import datetime
+from functools import partial
+
+# rich content types counted as media files for the most active day
+media_types = frozenset({'photo', 'video'})
 
 
 class Message:
@@ -29,11 +34,9 @@ class Message:
                                applicable rich contents such as voice call, 
                                video call and Live Talk.
     """
-    time = None
-    author = None
-    content = None
-    rich_content_type = None
-    rich_content_duration = None
+    # No per-instance __dict__, as a chat log holds a Message for every line
+    __slots__ = ('time', 'author', 'content', 'rich_content_type',
+                 'rich_content_duration')
 
     def __init__(self, time: datetime, author: str, content: str, 
                  rich_content_type: str = None, rich_content_duration = None) -> None:
@@ -76,10 +79,13 @@ class Message:
     def get_word_count(self) -> int:
         """Returns the number of words in the message.
 
+        Same as `len(self.get_words())`, counted without creating the list of
+        words.
+
         Returns:
             int: A number of words included in the message.
         """
-        return len(self.get_words())
+        return self.content.count(' ') + 1
 
     def get_letter_count(self) -> int:
         """Returns the number of letters in the message.
@@ -104,8 +110,7 @@ class Event:
                     Will be either 'invite' or 'leave'.
         content: A string of the content of the event.
     """
-    event_type = None
-    content = None
+    __slots__ = ('event_type', 'content')
 
     def __init__(self, event_type: str, content: str) -> None:
         """Initializes Event from event type and content.
@@ -144,19 +149,12 @@ class Chatroom:
 
     title = None
     date_saved = None
-    messages = []
-    events = []
     start_date = None
     end_date = None
 
     # Local variables used for statistics
 
     message_count = 0
-    message_count_by_month = {}  # {'yymm': int} format
-    message_count_by_day_of_week = {}  # {int: int} format, key 0 being Monday
-    message_count_by_time_of_day = {}  # {int: int} format, key 0 being 12AM
-    message_count_by_participant = {}  # {'name': int} format
-    message_count_by_participant_and_month = {}  # {'yymm': {'name': int}} format
 
     day_count = 0
     word_count = 0
@@ -170,31 +168,6 @@ class Chatroom:
     date_media_count = 0
     date_sticker_count = 0
 
-    rich_content_count = {
-        'sticker': 0,
-        'photo': 0,
-        'video': 0,
-        'deleted': 0,
-        'voice_note': 0,
-        'youtube_link': 0,
-        'link': 0,
-        'file': 0,
-        'voice_call': 0,
-        'video_call': 0,
-        'live_talk': 0,
-    }
-
-    rich_content_duration = {
-        'voice_call': 0,  # in seconds
-        'video_call': 0,  # in seconds
-        'live_talk': 0,  # in seconds
-    }
-
-    event_count = {
-        'invite': 0,
-        'leave': 0
-    }
-
     def __init__(self, title: str, date_saved: datetime) -> None:
         """Initializes Chatroom from title and saved date.
 
@@ -204,6 +177,44 @@ class Chatroom:
         """
         self.title = title
         self.date_saved = date_saved
+
+        # Containers are created per instance, so that each Chatroom (and its
+        # pickle) holds its own statistics instead of sharing class attributes
+        self.messages = []
+        self.events = []
+
+        self.message_count_by_month = defaultdict(int)  # {'yymm': int} format
+        self.message_count_by_day_of_week = [0] * 7  # [int] format, index 0 being Monday
+        self.message_count_by_time_of_day = [0] * 24  # [int] format, index 0 being 12AM
+        self.message_count_by_participant = defaultdict(int)  # {'name': int} format
+        # partial instead of a lambda keeps the nested defaultdict picklable
+        self.message_count_by_participant_and_month = \
+            defaultdict(partial(defaultdict, int))  # {'yymm': {'name': int}} format
+
+        self.rich_content_count = {
+            'sticker': 0,
+            'photo': 0,
+            'video': 0,
+            'deleted': 0,
+            'voice_note': 0,
+            'youtube_link': 0,
+            'link': 0,
+            'file': 0,
+            'voice_call': 0,
+            'video_call': 0,
+            'live_talk': 0,
+        }
+
+        self.rich_content_duration = {
+            'voice_call': 0,  # in seconds
+            'video_call': 0,  # in seconds
+            'live_talk': 0,  # in seconds
+        }
+
+        self.event_count = {
+            'invite': 0,
+            'leave': 0
+        }
     
     def add_message(self, msg: Message) -> None:
         """Adds a message to the Chatroom instance.
@@ -213,49 +224,26 @@ class Chatroom:
         """
         self.messages.append(msg)
 
-        # Remove _hr exception
-        if msg.rich_content_type is not None and '_hr' in msg.rich_content_type:
-            # Remove '_hr' from the last message instance
-            self.messages[-1].rich_content_type = msg.rich_content_type.replace('_hr', '')
-
         # message_count
         self.message_count += 1
 
+        time = msg.time
+
         # message_count_by_month
-        month = msg.time.strftime('%Y%m')
-        if month in self.message_count_by_month:
-            self.message_count_by_month[month] += 1
-        else:
-            self.message_count_by_month[month] = 1
+        month = f'{time.year:04d}{time.month:02d}'  # same as strftime('%Y%m')
+        self.message_count_by_month[month] += 1
 
         # message_count_by_day_of_week
-        day = msg.time.weekday()
-        if day in self.message_count_by_day_of_week:
-            self.message_count_by_day_of_week[day] += 1
-        else:
-            self.message_count_by_day_of_week[day] = 1
+        self.message_count_by_day_of_week[time.weekday()] += 1
         
         # message_count_by_time_of_day
-        hour = msg.get_hour()
-        if hour in self.message_count_by_time_of_day:
-            self.message_count_by_time_of_day[hour] += 1
-        else:
-            self.message_count_by_time_of_day[hour] = 1
+        self.message_count_by_time_of_day[time.hour] += 1
 
         # message_count_by_participant
-        if msg.author in self.message_count_by_participant:
-            self.message_count_by_participant[msg.author] += 1
-        else:
-            self.message_count_by_participant[msg.author] = 1
+        self.message_count_by_participant[msg.author] += 1
 
         # message_count_by_participant_and_month
-        if month in self.message_count_by_participant_and_month:
-            if msg.author in self.message_count_by_participant_and_month[month]:
-                self.message_count_by_participant_and_month[month][msg.author] += 1
-            else:
-                self.message_count_by_participant_and_month[month][msg.author] = 1
-        else:
-            self.message_count_by_participant_and_month[month] = {msg.author: 1}
+        self.message_count_by_participant_and_month[month][msg.author] += 1
 
         
         # word_count
@@ -268,23 +256,25 @@ class Chatroom:
         # date_message_count
         self.date_message_count += 1
 
-        # date_media_count
-        if msg.rich_content_type is 'photo' or msg.rich_content_type is 'video':
-            self.date_media_count += 1
-        
-        # date_sticker_count
-        if msg.rich_content_type is 'sticker':
-            self.date_sticker_count += 1
+        # Plain text messages, the majority, have no rich content to count
+        rich_content_type = msg.rich_content_type
+        if rich_content_type is not None:
 
-        
-        # rich_content_count
-        if msg.rich_content_type is not None:
-            self.rich_content_count[msg.rich_content_type] += 1
-        
-        # rich_content_duration
-        if msg.rich_content_duration is not None:
-            self.rich_content_duration[msg.rich_content_type] += \
-                msg.rich_content_duration
+            # date_media_count
+            if rich_content_type in media_types:
+                self.date_media_count += 1
+
+            # date_sticker_count
+            elif rich_content_type == 'sticker':
+                self.date_sticker_count += 1
+
+            # rich_content_count
+            self.rich_content_count[rich_content_type] += 1
+
+            # rich_content_duration
+            if msg.rich_content_duration is not None:
+                self.rich_content_duration[rich_content_type] += \
+                    msg.rich_content_duration
 
     def add_event(self, event: Event) -> None:
         """Adds an event to the Chatroom instance.
@@ -296,6 +286,46 @@ class Chatroom:
 
         self.event_count[event.event_type] += 1
 
+    @classmethod
+    def from_stream(cls, title: str, date_saved: datetime, items) -> 'Chatroom':
+        """Creates a Chatroom from the contents yielded by the parser.
+
+        Args:
+            title (str): A string of the title of the chatroom.
+            date_saved (datetime): A datetime instance of the saved date metadata.
+            items: An iterable of date tags, messages and events, such as
+                   `kakaotalk_parser.iter_chat()`.
+
+        Returns:
+            A kakaotalk.Chatroom instance with the corresponding values.
+        """
+        chatroom = cls(title, date_saved)
+        chatroom.add_stream(items)
+        return chatroom
+
+    def add_stream(self, items) -> None:
+        """Adds the contents yielded by the parser to the Chatroom instance.
+
+        Args:
+            items: An iterable of datetime instances for date tags,
+                   kakaotalk.Message instances and kakaotalk.Event instances,
+                   in the order they appear in the chat log.
+        """
+        for item in items:
+            if isinstance(item, Message):
+                self.add_message(item)
+            elif isinstance(item, Event):
+                self.add_event(item)
+            else:
+                # Date tag, update start_date on the first one
+                if self.start_date is None:
+                    self.set_start_date(item)
+                self.set_end_date(item)
+
+        # The last day has no date tag after it to end it
+        if self.end_date is not None:
+            self.update_most_active_day()
+
     def set_start_date(self, date: datetime) -> None:
         """Sets start date of the chatroom.
 
@@ -312,24 +342,33 @@ class Chatroom:
         Args:
             date (datetime): A datetime instance of the last message.
         """
-        # Update most active day
-        if self.date_most_active_message[1] < self.date_message_count:
-            self.date_most_active_message = (self.end_date, self.date_message_count)
-        if self.date_most_active_media[1] < self.date_media_count:
-            self.date_most_active_media = (self.end_date, self.date_media_count)
-        if self.date_most_active_sticker[1] < self.date_sticker_count:
-            self.date_most_active_sticker = (self.end_date, self.date_sticker_count)
+        # Update most active day with the day that just ended
+        if self.end_date is not None:
+            self.update_most_active_day()
 
         self.end_date = date
         
         # Reset daily counter
-        self.date_message_count = 0
-        self.date_media_count = 0
-        self.date_sticker_count = 0
+        self.date_message_count = self.date_media_count = \
+            self.date_sticker_count = 0
 
         # day_count
         self.day_count += 1
 
+    def update_most_active_day(self) -> None:
+        """Updates the most active days with the counters of the current day.
+
+        The daily counters belong to `end_date`, the date of the last date tag.
+        Called by set_end_date() when a day ends, and by add_stream() for the
+        last day of the chat log, which isn't followed by another date tag.
+        """
+        if self.date_most_active_message[1] < self.date_message_count:
+            self.date_most_active_message = (self.end_date, self.date_message_count)
+        if self.date_most_active_media[1] < self.date_media_count:
+            self.date_most_active_media = (self.end_date, self.date_media_count)
+        if self.date_most_active_sticker[1] < self.date_sticker_count:
+            self.date_most_active_sticker = (self.end_date, self.date_sticker_count)
+
     def get_average_words_per_message(self) -> float:
         return self.word_count / self.message_count
     
@@ -343,6 +382,10 @@ class Chatroom:
         return self.letter_count / self.day_count
     
     def __str__(s) -> str:
+        participant_and_month = {
+            month: dict(count)
+            for month, count in s.message_count_by_participant_and_month.items()
+        }
         return f"""KakaoTalk-Analyzer
 "{s.title}"
 
@@ -351,11 +394,11 @@ from {s.start_date.strftime('%b %d, %Y')} until {s.end_date.strftime('%b %d, %Y'
 
 > Timeline
 message stats by...
-\t - month = {s.message_count_by_month}
-\t - day of week = {s.message_count_by_day_of_week}
-\t - time of day = {s.message_count_by_time_of_day}
-\t - participant = {s.message_count_by_participant}
-\t - participant X month = {s.message_count_by_participant_and_month}
+\t - month = {dict(s.message_count_by_month)}
+\t - day of week = {dict(enumerate(s.message_count_by_day_of_week))}
+\t - time of day = {dict(enumerate(s.message_count_by_time_of_day))}
+\t - participant = {dict(s.message_count_by_participant)}
+\t - participant X month = {participant_and_month}
 
 > Total numbers
 days = {s.day_count}
@@ -1,33 +1,80 @@
 import re  # regex
+import sys
+from collections import defaultdict
 from datetime import datetime
+from operator import itemgetter
 
 log_mode = False
 
+# patterns compiled once, instead of on every line
+chat_regex = re.compile(r'\[(.{,20})\] \[(\d{,2}:\d{,2}\s\w\w)\] (.*)')
+invite_regex = re.compile(r'(.*) invited (.*)\.')
+leave_regex = re.compile(r'(.*) left\.')
+chat_line_regex = re.compile(r'\[.{,20}\] \[.{,8}\] .*')
+date_regex = re.compile(r'--------------- (.+) ---------------')
+metadata_regex = re.compile(r'(.*) with|Date Saved : (.*)')
+
+months = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6,
+    'July': 7, 'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12
+}
+
 
 def log(message):
     if log_mode:
         print(message)
 
+
+# same as datetime.combine(date, datetime.strptime(time, "%I:%M %p").time())
+def parse_time(date, time):
+    hour, minute = time.split(':')
+    minute, ampm = minute.split()
+    hour = int(hour) % 12
+    if ampm.upper() == 'PM':
+        hour += 12
+    return datetime(date.year, date.month, date.day, hour, int(minute))
+
+
+# same as datetime.strptime(date, "%A, %B %d, %Y")
+def parse_date(date):
+    fields = date.replace(',', '').split(' ')
+    if len(fields) != 4 or fields[1] not in months:
+        # raise ValueError like strptime, instead of an unpacking or KeyError
+        raise ValueError('unknown date tag format: ' + date)
+    _, month, day, year = fields
+    return datetime(int(year), months[month], int(day))
+
         
 
 
 class Chat:
-    time = None  # datetime object
-    name = None
-    message = None
-
     def __init__(self, data, date):
-        matches = re.match(r'\[(.{,20})\] \[(\d{,2}:\d{,2}\s\w\w)\] (.*)', data)
+        self.time = None  # datetime object
+        self.name = None
+        self.message = None
+        self.word_count = 0
+        self.character_count = 0
+
+        matches = chat_regex.match(data)
 
         if matches is not None:
             if date is not None:
-                self.time = datetime.combine(date, datetime.strptime(matches.group(2), "%I:%M %p").time())
-            self.name = matches.group(1)
+                self.time = parse_time(date, matches.group(2))
+            self.name = sys.intern(matches.group(1))  # a single string object for each participant
             self.message = matches.group(3)
 
+            # counted once, same as len(self.get_words()) and the sum of the word lengths
+            spaces = self.message.count(' ')
+            self.word_count = spaces + 1
+            self.character_count = len(self.message) - spaces
+
     def append(self, data):
         self.message = self.message + '\n' + data
 
+        spaces = data.count(' ')
+        self.word_count += spaces
+        self.character_count += len(data) + 1 - spaces
+
     def get_words(self):
         if self.message is not None:
             return self.message.split(' ')
@@ -35,110 +82,112 @@ class Chat:
             return []
 
     def get_word_count(self):
-        return len(self.get_words())
+        return self.word_count
 
     def get_character_count(self):
-        count = 0
-
-        for word in self.get_words():
-            count += len(word)
-
-        return count
+        return self.character_count
 
 
 class Invite:
-    host = None
-    guest = None
-
     def __init__(self, data):
-        matches = re.match(r'(.*) invited (.*)\.', data)
-        host = matches.group(1)
-        guest = matches.group(2)
+        matches = invite_regex.match(data)
+        self.host = matches.group(1)
+        self.guest = matches.group(2)
 
 
 class Leave:
-    name = None
-
     def __init__(self, data):
-        matches = re.match(r'(.*) left\.', data)
-        name = matches.group(1)
+        matches = leave_regex.match(data)
+        self.name = matches.group(1)
 
 
 class Chatroom:
-    name = None
-    date_saved = None
-    chats = []  # chat object list
-    invites = []
-    leaves = []
-    dates = []
-    start_date = None
-    end_date = None
-
     def __init__(self, filename):
+        # per instance, so that each Chatroom holds only the chats of its own file
+        self.name = None
+        self.date_saved = None
+        self.chats = []  # chat object list
+        self.invites = []
+        self.leaves = []
+        self.dates = []
+        self.start_date = None
+        self.end_date = None
+        self._stats = None
+
         # split date / chats
         log("Slicing text data")
-        regex = '|'.join([
-            '(\\[.{,20}\\] \\[.{,8}\\] .*)',  # chat
-            '--------------- (.+) ---------------',  # date
-            '(.* invited .*\\.)',  # invite
-            '(.* left\\.)'  # leave
-        ])
 
         date = None
         chat_count = 0
+        last_chat = None  # chat that following unmatched lines continue, None after a date tag or an event
+
+        # read in 1 MiB chunks instead of the default 8 KiB, exports are often tens of megabytes
+        f = open(filename, 'r', encoding='UTF-8', buffering=1 << 20)
 
-        f = open(filename, 'r', encoding='UTF-8')
+        # metadata, the chatroom name and the saved date on the first two lines
+        for line in (f.readline(), f.readline()):
+            matches = metadata_regex.match(line)
+
+            if matches is not None and matches.group(1) is not None:
+                self.name = matches.group(1)
+                log("Chatroom name: " + self.name)
+
+            elif matches is not None and matches.group(2) is not None:
+                self.date_saved = datetime.strptime(matches.group(2), "%Y-%m-%d %H:%M:%S")
+                log("Date saved: " + str(self.date_saved))
 
         for line in f:
 
-            matches = re.match(regex, line)
+            # check the first character and keywords of each line type
+            # before running its pattern, instead of a single alternation
+            first = line[:1]
 
-            if matches is not None and matches.group(1) is not None:
-                self.chats.append(Chat(line, date))
+            if first == '[' and chat_line_regex.match(line) is not None:
+                last_chat = Chat(line, date)
+                self.chats.append(last_chat)
                 chat_count += 1
                 log("Added chat with date " + str(date))
                 continue
 
-            if matches is not None and matches.group(2) is not None:
-                self.dates.append((date, chat_count))
-                date = datetime.strptime(re.match(regex, line).group(2), "%A, %B %d, %Y")
+            matches = date_regex.match(line) if first == '-' else None
+
+            if matches is not None:
+                # chats of the day that just ended
+                if date is not None:
+                    self.dates.append((date, chat_count))
+                chat_count = 0
+                last_chat = None
+
+                date = parse_date(matches.group(1))
                 if self.start_date is None:
                     self.start_date = date
                 log("Added date: " + str(date))
                 continue
 
-            if matches is not None and matches.group(3) is not None:
+            if ' invited ' in line and invite_regex.match(line) is not None:
                 self.invites.append(Invite(line))
+                last_chat = None
                 log("Added invite")
                 continue
 
-            if matches is not None and matches.group(4) is not None:
+            if ' left.' in line and leave_regex.match(line) is not None:
                 self.leaves.append(Leave(line))
+                last_chat = None
                 log("Added left")
                 continue
 
-            if len(self.chats) is 0:
-                # metadata
-                matches = re.match(r'(.*) with|Date Saved : (.*)', line)
-
-                if matches is not None and matches.group(1) is not None:
-                    name = re.match(r'(.*) with|Date Saved : (.*)', line).group(1)
-                    log("Chatroom name: " + name)
-                    continue
-
-                if matches is not None and matches.group(2) is not None:
-                    self.date_saved = datetime.strptime(re.match(r'(.*) with|Date Saved : (.*)', line).group(2),
-                                                        "%Y-%m-%d %H:%M:%S")
-                    log("Date saved: " + str(self.date_saved))
-                    continue
-
-            elif self.chats[-1] is Chat:
-                # multi-line message
-                self.chats[-1].append(line)
+            # unmatched lines after a date tag or an event continue no chat and are skipped
+            if last_chat is not None and last_chat.message is not None:
+                # multi-line message, without the line break like the first line
+                last_chat.append(line.rstrip('\n'))
                 log("Added multi-line chat")
 
         f.close()
 
+        # the last day isn't followed by another date tag
+        if date is not None:
+            self.dates.append((date, chat_count))
+
         self.end_date = date
 
     def get_chat_span(self):
@@ -147,192 +196,136 @@ class Chatroom:
     def get_chat_span_days(self):
         return (self.end_date.date() - self.start_date.date()).days
 
-    def get_total_chats(self):
-        return len(self.chats)
-
-    def get_total_words(self):
-        count = 0
+    # totals, daily, hourly, weekly and per-name counts, computed in a single pass over the chats
+    # on first use, the getters return copies so that callers can't modify them
+    def _compute_stats(self):
+        if self._stats is not None:
+            return self._stats
+
+        total_words = 0
+        total_characters = 0
+        days = []  # [date, chats, words, characters] of each day, in order
+        hourly_chats = [0] * 24
+        hourly_words = [0] * 24
+        hourly_characters = [0] * 24
+        weekly_chats = [0] * 7
+        weekly_words = [0] * 7
+        weekly_characters = [0] * 7
+        name_chats = defaultdict(int)
+        name_words = defaultdict(int)
+        name_characters = defaultdict(int)
 
         for chat in self.chats:
-            count += chat.get_word_count()
+            words = chat.word_count
+            characters = chat.character_count
 
-        return count
-
-    def get_total_characters(self):
-        count = 0
+            total_words += words
+            total_characters += characters
 
-        for chat in self.chats:
-            count += chat.get_character_count()
-
-        return count
-
-    def get_daily_chats(self):
-        result = []
-        count = 0
-
-        for i in range(len(self.chats)):
-            count += 1
-            try:
-                if self.chats[i].time.date != self.chats[i + 1].time.date:
+            if chat.time is not None:
+                date = chat.time.date()
+                if not days or days[-1][0] != date:
                     # day change
-                    result.append((self.chats[i].time.date, count))
-            except:
-                result.append((self.chats[i].time.date, count))
+                    days.append([date, 0, 0, 0])
+                today = days[-1]
+                today[1] += 1
+                today[2] += words
+                today[3] += characters
+
+                hour = chat.time.hour
+                hourly_chats[hour] += 1
+                hourly_words[hour] += words
+                hourly_characters[hour] += characters
+
+                day = chat.time.weekday()
+                weekly_chats[day] += 1
+                weekly_words[day] += words
+                weekly_characters[day] += characters
+
+            name = chat.name
+            name_chats[name] += 1
+            name_words[name] += words
+            name_characters[name] += characters
+
+        self._stats = {
+            'total_words': total_words,
+            'total_characters': total_characters,
+            'daily_chats': [(day[0], day[1]) for day in days],
+            'daily_words': [(day[0], day[2]) for day in days],
+            'daily_characters': [(day[0], day[3]) for day in days],
+            'hourly_chats': hourly_chats,
+            'hourly_words': hourly_words,
+            'hourly_characters': hourly_characters,
+            'weekly_chats': weekly_chats,
+            'weekly_words': weekly_words,
+            'weekly_characters': weekly_characters,
+            'name_chats': dict(name_chats),
+            'name_words': dict(name_words),
+            'name_characters': dict(name_characters),
+        }
+
+        return self._stats
 
-        return result
+    def get_total_chats(self):
+        return len(self.chats)
 
-    def get_daily_words(self):
-        result = []
-        count = 0
+    def get_total_words(self):
+        return self._compute_stats()['total_words']
 
-        for i in range(len(self.chats)):
-            count += self.chats[i].get_word_count()
+    def get_total_characters(self):
+        return self._compute_stats()['total_characters']
 
-            try:
-                if self.chats[i].time.date != self.chats[i + 1].time.date:
-                    # day change
-                    result.append((self.chats[i].time.date, count))
-            except:
-                result.append((self.chats[i].time.date, count))
+    def get_daily_chats(self):
+        return list(self._compute_stats()['daily_chats'])
 
-        return result
+    def get_daily_words(self):
+        return list(self._compute_stats()['daily_words'])
 
     def get_daily_characters(self):
-        result = []
-        count = 0
-
-        for i in range(len(self.chats)):
-            count += self.chats[i].get_character_count()
-
-            try:
-                if self.chats[i].time.date != self.chats[i + 1].time.date:
-                    # day change
-                    result.append((self.chats[i].time.date, count))
-            except:
-                result.append((self.chats[i].time.date, count))
-
-        return result
+        return list(self._compute_stats()['daily_characters'])
 
     def get_hourly_chats(self):
-        result = [0] * 24
-
-        for chat in self.chats:
-            hour = chat.time.hour
-            result[hour] += 1
-
-        return result
+        return list(self._compute_stats()['hourly_chats'])
 
     def get_hourly_words(self):
-        result = [0] * 24
-
-        for chat in self.chats:
-            hour = chat.time.hour
-            result[hour] += chat.get_word_count()
-
-        return result
+        return list(self._compute_stats()['hourly_words'])
 
     def get_hourly_characters(self):
-        result = [0] * 24
-
-        for chat in self.chats:
-            hour = chat.time.hour
-            result[hour] += chat.get_character_count()
-
-        return result
+        return list(self._compute_stats()['hourly_characters'])
 
     def get_weekly_chats(self):
-        result = [0] * 7
-
-        for chat in self.chats:
-            day = chat.time.weekday()
-            result[day] += 1
-
-        return result
+        return list(self._compute_stats()['weekly_chats'])
 
     def get_weekly_words(self):
-        result = [0] * 7
-
-        for chat in self.chats:
-            day = chat.time.weekday()
-            result[day] += chat.get_word_count()
-
-        return result
+        return list(self._compute_stats()['weekly_words'])
 
     def get_weekly_characters(self):
-        result = [0] * 7
-
-        for chat in self.chats:
-            day = chat.time.weekday()
-            result[day] += chat.get_character_count()
-
-        return result
+        return list(self._compute_stats()['weekly_characters'])
 
     def get_name_chats(self):
-        result = {}
-
-        for chat in self.chats:
-            if chat.name not in result.keys():
-                result[chat.name] = 1
-            else:
-                result[chat.name] += 1
-
-        return result
+        return dict(self._compute_stats()['name_chats'])
 
     def get_name_words(self):
-        result = {}
-
-        for chat in self.chats:
-            if chat.name not in result.keys():
-                result[chat.name] = chat.get_word_count()
-            else:
-                result[chat.name] += chat.get_word_count()
-
-        return result
+        return dict(self._compute_stats()['name_words'])
 
     def get_name_characters(self):
-        result = {}
-
-        for chat in self.chats:
-            if chat.name not in result.keys():
-                result[chat.name] = chat.get_character_count()
-            else:
-                result[chat.name] += chat.get_character_count()
-
-        return result
+        return dict(self._compute_stats()['name_characters'])
 
+    # new dicts of the share of each name, the cached counts are read without copying them
     def get_name_chats_volume(self):
         total = self.get_total_chats()
-        data = self.get_name_chats()
-        result = data
-
-        for key in result.keys():
-            result[key] = result[key] / total
-
-        return result
+        return {name: count / total for name, count in self._compute_stats()['name_chats'].items()}
 
     def get_name_words_volume(self):
         total = self.get_total_words()
-        data = self.get_name_words()
-        result = data
-
-        for key in result.keys():
-            result[key] = result[key] / total
-
-        return result
+        return {name: count / total for name, count in self._compute_stats()['name_words'].items()}
 
     def get_name_characters_volume(self):
         total = self.get_total_characters()
-        data = self.get_name_characters()
-        result = data
-
-        for key in result.keys():
-            result[key] = result[key] / total
-
-        return result
+        return {name: count / total for name, count in self._compute_stats()['name_characters'].items()}
 
     def get_names(self):
-        data = self.get_name_chats()
-        return data.keys()
+        return self._compute_stats()['name_chats'].keys()
 
     def get_words_per_chat(self):
         words = self.get_total_words()
@@ -355,14 +348,7 @@ class Chatroom:
         return characters / day
 
     def get_most_active_day(self):
-
-        max = (None, -1)
-
-        for day in self.dates:
-            if day[1] > max[1]:
-                max = day
-
-        return max
+        return max(self.dates, key=itemgetter(1), default=(None, -1))
 
 
 test_filename = "data.txt"
@@ -13,8 +13,10 @@ UTF-8 encoded.
 
 from kakaotalk import Chatroom, Message, Event
 
-import traceback
+import os
 import re
+import sys
+import pickle
 import logging as log
 from datetime import datetime
 
@@ -47,58 +49,49 @@ Date Saved: {YYYY}-{MM}-{DD} {HH}:{MM}:{SS}                   # Metadata 2
 {participant} left.                                           # Leave event
 '''
 
-en_metadata_1 = '(.{,50}) with KakaoTalk Chats'
-                # group(1): chatroom title
-en_metadata_2 = 'Date Saved : (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})'
-                # group(1): chat export timestamp
-                # - parse with strptime(match, '%Y-%m-%d %H:%M:%S')
-
-en_date_tag = '--------------- \w+, (\w+ \d{,2}, \d{4}) ---------------'
-              # group(1): date tag
-              # - parse with strptime(match, '%B %d, %Y')
-en_message = '\\[(.{,20})\\] \\[(\d{,2}):(\d{2}) (\w)M\\] (.*)'
-             # group(1): participant name
-             # group(2): hour (12H format)
-             # group(3): minute
-             # group(4): A or P for AM and PM each
-             # group(5): message content
-             # TODO: add multi-line message match support
+en_metadata_1 = r'(.{0,50}) with KakaoTalk Chats'
+                 # group(1): chatroom title
+en_metadata_2 = r'Date Saved : (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})'
+                 # group(1): chat export timestamp
+                 # - parse with datetime.fromisoformat(match)
+
+en_date_tag = r'--------------- \w+, (\w+ \d{0,2}, \d{4}) ---------------'
+               # group(1): date tag
+               # - parse with parse_date_tag_en(match)
+en_message = r'\[([^\]]{0,20})\] \[(\d{1,2}):(\d{2}) (\w)M\] (.*)'
+              # group(1): participant name
+              # group(2): hour (12H format)
+              # group(3): minute
+              # group(4): A or P for AM and PM each
+              # group(5): message content
+              # TODO: add multi-line message match support
 
 en_rich_content_photo = 'Photo'
 en_rich_content_video = 'videos'
 en_rich_content_file = 'File: (.+)'
-en_rich_content_link = '(http.+|www\\..+)'
-en_rich_content_youtube_link = '(http.+youtu.+)'
+en_rich_content_link = r'(?:https?://|www\.)\S+'
+en_rich_content_youtube_link = r'https?://\S*youtu\S+'
 en_rich_content_sticker = 'Emoticons'
-en_rich_content_voice_call = 'Voice Call (\d+):(\d+)'
-                             # group(1): minute
-                             # group(2): second
-en_rich_content_voice_call_hr = 'Voice Call (\d+):(\d+):(\d+)' # voice call > 1h
-                                # group(1): hour
-                                # group(2): minute
-                                # group(3): second
-en_rich_content_video_call = 'Video Call (\d+):(\d+)'
-                             # group(1): minute
-                             # group(2): second
-en_rich_content_video_call_hr = 'Video Call (\d+):(\d+):(\d+)' # video call > 1h
-                                # group(1): hour
-                                # group(2): minute
-                                # group(3): second
-en_rich_content_live_talk = 'Live Talk ended (\d+):(\d+)'
-                            # group(1): minute
-                            # group(2): second
-en_rich_content_live_talk_hr = 'Live Talk ended (\d+):(\d+):(\d+)' # live talk > 1h
-                               # group(1): hour
-                               # group(2): minute
-                               # group(3): second
+en_rich_content_voice_call = r'Voice Call (\d+):(\d+)(?::(\d+))?'
+                              # group(1): minute, or hour if group(3) is matched
+                              # group(2): second, or minute if group(3) is matched
+                              # group(3): second, only for voice calls > 1h
+en_rich_content_video_call = r'Video Call (\d+):(\d+)(?::(\d+))?'
+                              # group(1): minute, or hour if group(3) is matched
+                              # group(2): second, or minute if group(3) is matched
+                              # group(3): second, only for video calls > 1h
+en_rich_content_live_talk = r'Live Talk ended (\d+):(\d+)(?::(\d+))?'
+                             # group(1): minute, or hour if group(3) is matched
+                             # group(2): second, or minute if group(3) is matched
+                             # group(3): second, only for live talks > 1h
 en_rich_content_voice_note = 'Voice Note'
 en_rich_content_deleted = 'This message was deleted.'
 
-en_event_invite = '(.{,20}) invited (.+)\\.'
-                  # group(1): inviter
-                  # group(2): invitee (could be a list of names)
-en_event_leave = '(.{,20}) left\\.'
-                 # group(1): left participant
+en_event_invite = r'(.{0,20}) invited (.+)\.'
+                   # group(1): inviter
+                   # group(2): invitee (could be a list of names)
+en_event_leave = r'(.{0,20}) left\.'
+                  # group(1): left participant
 
 '''
 KakaoTalk chat export format (v3.2.6.2748, May 2021) - Korean locale
@@ -125,58 +118,49 @@ KakaoTalk chat export format (v3.2.6.2748, May 2021) - Korean locale
 {participant}님이 나갔습니다.                                     # Leave event
 '''
 
-ko_metadata_1 = '(.{,50}) 님과 카카오톡 대화'
-                # group(1): chatroom title
-ko_metadata_2 = '저장한 날짜 : (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})'
-                # group(1): chat export timestamp
-                # - parse with strptime(match, '%Y-%m-%d %H:%M:%S')
-
-ko_date_tag = '--------------- (\d{4}년 \d{,2}월 \d{,2}일) .요일 ---------------'
-              # group(1): date tag
-              # - parse with strptime(match, '%Y년 %m월 %d일')
-ko_message = '\\[(.{,20})\\] \\[오(\w) (\d{,2}):(\d{2})\\] (.*)'
-             # group(1): participant name
-             # group(2): '전' or '후' for AM and PM each
-             # group(3): hour (12H format)
-             # group(4): minute
-             # group(5): message content
-             # TODO: add multi-line message match support
+ko_metadata_1 = r'(.{0,50}) 님과 카카오톡 대화'
+                 # group(1): chatroom title
+ko_metadata_2 = r'저장한 날짜 : (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})'
+                 # group(1): chat export timestamp
+                 # - parse with datetime.fromisoformat(match)
+
+ko_date_tag = r'--------------- (\d{4}년 \d{0,2}월 \d{0,2}일) .요일 ---------------'
+               # group(1): date tag
+               # - parse with parse_date_tag_ko(match)
+ko_message = r'\[([^\]]{0,20})\] \[오(\w) (\d{1,2}):(\d{2})\] (.*)'
+              # group(1): participant name
+              # group(2): '전' or '후' for AM and PM each
+              # group(3): hour (12H format)
+              # group(4): minute
+              # group(5): message content
+              # TODO: add multi-line message match support
 
 ko_rich_content_photo = '사진'
 ko_rich_content_video = '동영상'
 ko_rich_content_file = '파일: (.+)'
-ko_rich_content_link = '(http.+|www\\..+)'
-ko_rich_content_youtube_link = '(http.+youtu.+)'
+ko_rich_content_link = r'(?:https?://|www\.)\S+'
+ko_rich_content_youtube_link = r'https?://\S*youtu\S+'
 ko_rich_content_sticker = '이모티콘'
-ko_rich_content_voice_call = 'Voice Call (\d+):(\d+)'
-                             # group(1): minute
-                             # group(2): second
-ko_rich_content_voice_call_hr = 'Voice Call (\d+):(\d+):(\d+)' # voice call > 1h
-                                # group(1): hour
-                                # group(2): minute
-                                # group(3): second
-ko_rich_content_video_call = 'Video Call (\d+):(\d+)'
-                             # group(1): minute
-                             # group(2): second
-ko_rich_content_video_call_hr = 'Video Call (\d+):(\d+):(\d+)' # video call > 1h
-                                # group(1): hour
-                                # group(2): minute
-                                # group(3): second
-ko_rich_content_live_talk = 'Live Talk ended (\d+):(\d+)'
-                            # group(1): minute
-                            # group(2): second
-ko_rich_content_live_talk_hr = 'Live Talk ended (\d+):(\d+):(\d+)' # live talk > 1h
-                               # group(1): hour
-                               # group(2): minute
-                               # group(3): second
+ko_rich_content_voice_call = r'Voice Call (\d+):(\d+)(?::(\d+))?'
+                              # group(1): minute, or hour if group(3) is matched
+                              # group(2): second, or minute if group(3) is matched
+                              # group(3): second, only for voice calls > 1h
+ko_rich_content_video_call = r'Video Call (\d+):(\d+)(?::(\d+))?'
+                              # group(1): minute, or hour if group(3) is matched
+                              # group(2): second, or minute if group(3) is matched
+                              # group(3): second, only for video calls > 1h
+ko_rich_content_live_talk = r'Live Talk ended (\d+):(\d+)(?::(\d+))?'
+                             # group(1): minute, or hour if group(3) is matched
+                             # group(2): second, or minute if group(3) is matched
+                             # group(3): second, only for live talks > 1h
 ko_rich_content_voice_note = 'Voice Note'
 ko_rich_content_deleted = '삭제된 메시지입니다.'
 
-ko_event_invite = '(.{,20})님이 (.+)님을 초대하였습니다\\.'
-                  # group(1): inviter
-                  # group(2): invitee (could be a list of names)
-ko_event_leave = '(.{,20})님이 나갔습니다\\.'
-                 # group(1): left participant
+ko_event_invite = r'(.{0,20})님이 (.+)님을 초대하였습니다\.'
+                   # group(1): inviter
+                   # group(2): invitee (could be a list of names)
+ko_event_leave = r'(.{0,20})님이 나갔습니다\.'
+                  # group(1): left participant
 
 # list of rich content types that don't require regex
 # used to iterate through to check all rich content types
@@ -197,31 +181,54 @@ rich_content_regex_types = [
     ]
 
 # list of rich content types that require regex and also includes duration
-rich_content_regex_duraton_types = [
+rich_content_regex_duration_types = [
     'voice_call', 
     'video_call', 
-    'voice_call_hr', 
-    'video_call_hr', 
     'live_talk', 
-    'live_talk_hr', 
     ]
 
-# list of date tag format to be used in datetime.strptime() by locale
-date_tag_format = {
-    'en': '%B %d, %Y',
-    'ko': '%Y년 %m월 %d일'
+# suffix of the file name of the cached parse result, see load_cache()
+cache_suffix = '.analyzer.pkl'
+
+# version of the cached parse result, increase when kakaotalk.Chatroom changes
+cache_version = 7
+
+# buffer size of the chat log reader, chat logs are often tens of megabytes
+read_buffer_size = 1 << 20
+
+# month number by month name, used to parse English date tags
+months_en = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4,
+    'May': 5, 'June': 6, 'July': 7, 'August': 8,
+    'September': 9, 'October': 10, 'November': 11, 'December': 12
 }
 
 # list of locales supported
 locales = ['en', 'ko']
 
-# hours that has to be added depending on the locale
-locale_hours = {
+# substring of the first line of the metadata unique to each locale
+# checked before matching metadata_1 to determine the locale
+locale_keyword = {
+    'en': ' with KakaoTalk Chats',
+    'ko': ' 님과 카카오톡 대화'
+}
+
+# PM indicator of the message time by locale, 12 hours are added if matched
+# 3AM becomes 3, 3PM becomes 3 + 12 = 15, 12AM becomes 0
+# 오전 3시 becomes 3, 오후 3시 becomes 3 + 12 = 15, 오전 12시 becomes 0
+locale_pm = {
+    'en': 'P',
+    'ko': '후'
+}
+
+# substring included in every line of each event type, by locale
+# checked before the event patterns to skip lines that can't be an event
+event_keyword = {
     'en': {
-        'A': 0, 'P': 12  # 3AM becomes 3, 3PM becomes 3 + 12 = 15
+        'invite': ' invited ', 'leave': ' left.'
     },
     'ko': {
-        '전': 0, '후': 12 # 오전 3시 becomes 3, 오후 3시 becomes 3 + 12 = 15
+        'invite': '님을 초대하였습니다.', 'leave': '님이 나갔습니다.'
     }
 }
 
@@ -256,11 +263,8 @@ match = {
             'youtube_link': en_rich_content_youtube_link,
             'sticker': en_rich_content_sticker,
             'voice_call': en_rich_content_voice_call,
-            'voice_call_hr': en_rich_content_video_call_hr,
             'video_call': en_rich_content_video_call,
-            'video_call_hr': en_rich_content_video_call_hr,
             'live_talk': en_rich_content_live_talk,
-            'live_talk_hr': en_rich_content_live_talk_hr,
             'voice_note': en_rich_content_voice_note,
             'deleted': en_rich_content_deleted,
         },
@@ -284,11 +288,8 @@ match = {
             'youtube_link': ko_rich_content_youtube_link,
             'sticker': ko_rich_content_sticker,
             'voice_call': ko_rich_content_voice_call,
-            'voice_call_hr': ko_rich_content_voice_call_hr,
             'video_call': ko_rich_content_video_call,
-            'video_call_hr': ko_rich_content_video_call_hr,
             'live_talk': ko_rich_content_live_talk,
-            'live_talk_hr': ko_rich_content_live_talk_hr,
             'voice_note': ko_rich_content_voice_note,
             'deleted': ko_rich_content_deleted,
         },
@@ -300,12 +301,502 @@ match = {
 }
 
 
-def parse(file_name: str):
+# rich content types that don't require regex, by locale
+# used to look up the type of a message with a single dict access
+rich_content_literal = {
+    l: {match[l]['rich_content'][rc_type]: rc_type
+        for rc_type in rich_content_types}
+    for l in locales
+}
+
+# single alternation of the rich content patterns that require regex, by locale
+# each alternative is a named group so that match.lastgroup gives the type
+# ordered the same way as the lists above, high-to-low in frequency
+# built in a comprehension so that no loop variable is left in the module
+match = {
+    l: {**match[l], 'rich_content_combined': '|'.join(
+        f"(?P<{rc_type}>{match[l]['rich_content'][rc_type]})"
+        for rc_type in rich_content_regex_types
+                     + rich_content_regex_duration_types)}
+    for l in locales
+}
+
+# literal prefixes every rich content pattern that requires regex starts with,
+# by locale, so that plain text messages skip the combined pattern entirely
+rich_content_prefix = {
+    'en': ('http', 'www.', 'File: ', 'Voice Call ', 'Video Call ',
+           'Live Talk ended '),
+    'ko': ('http', 'www.', '파일: ', 'Voice Call ', 'Video Call ',
+           'Live Talk ended '),
+}
+
+
+def _compile_all(patterns):
+    """Returns a copy of the pattern dict with every leaf compiled.
+
+    Args:
+        patterns: A (nested) dict of regex pattern strings.
+
+    Returns:
+        A dict of the same shape with `re.Pattern` instances as leaves.
+    """
+    if isinstance(patterns, dict):
+        return {k: _compile_all(v) for k, v in patterns.items()}
+    return re.compile(patterns)
+
+
+# compile every pattern once at import instead of on each re.match() call
+match = _compile_all(match)
+
+
+def _split_brackets(line: str):
+    """Splits a message line into its bracketed fields using `str.find`.
+
+    Shared by split_message_en() and split_message_ko(), which only differ in
+    the format of the time field. Like `en_message` and `ko_message`, the
+    participant name is at most 20 characters and can't contain ']'.
+
+    Args:
+        line (str): A line of the chat log.
+
+    Returns:
+        A tuple of (participant, time, content) strings, or None if the line
+        doesn't have the '[{participant}] [{time}] ' layout.
+    """
+    if line[:1] != '[':
+        return None
+    name_end = line.find(']', 1)
+    if name_end < 0 or name_end > 21 or not line.startswith(' [', name_end + 1):
+        return None
+    time_end = line.find('] ', name_end + 3)
+    if time_end < 0:
+        return None
+
+    return (line[1:name_end], line[name_end + 3:time_end],
+            line[time_end + 2:].rstrip('\n'))
+
+
+def split_message_en(line: str):
+    """Splits an English message line without using the regex engine.
+
+    Accepts the same lines as `en_message` and returns the same groups,
+    using only `str.find` and slicing.
+
+    Args:
+        line (str): A line of the chat log.
+
+    Returns:
+        A tuple of (participant, A or P, hour, minute, content) strings, or
+        None if the line is not a well-formed message.
+    """
+    fields = _split_brackets(line)
+    if fields is None:
+        return None
+    author, time, content = fields
+
+    # '{hh}:{MM} {A/P}M', with a 1 or 2 digit hour
+    colon = time.find(':')
+    hour = time[:colon]
+    minute = time[colon + 1:colon + 3]
+    ampm = time[-2:-1]
+    if not 1 <= colon <= 2 or len(time) != colon + 6 or time[colon + 3] != ' '\
+            or time[-1] != 'M' or not (hour + minute).isdecimal()\
+            or not (ampm.isalnum() or ampm == '_'):  # same as \w
+        return None
+
+    return author, ampm, hour, minute, content
+
+
+def split_message_ko(line: str):
+    """Splits a Korean message line without using the regex engine.
+
+    Accepts the same lines as `ko_message` and returns the same groups,
+    using only `str.find` and slicing.
+
+    Args:
+        line (str): A line of the chat log.
+
+    Returns:
+        A tuple of (participant, 전 or 후, hour, minute, content) strings, or
+        None if the line is not a well-formed message.
+    """
+    fields = _split_brackets(line)
+    if fields is None:
+        return None
+    author, time, content = fields
+
+    # '오{전/후} {hh}:{MM}', with a 1 or 2 digit hour
+    colon = time.find(':')
+    hour = time[3:colon]
+    minute = time[colon + 1:]
+    ampm = time[1:2]
+    if not 4 <= colon <= 5 or len(minute) != 2 or time[0] != '오'\
+            or time[2:3] != ' ' or not (hour + minute).isdecimal()\
+            or not (ampm.isalnum() or ampm == '_'):  # same as \w
+        return None
+
+    return author, ampm, hour, minute, content
+
+
+def parse_date_tag_en(tag: str) -> datetime:
+    """Parses the date of an English date tag without datetime.strptime().
+
+    Args:
+        tag (str): A string of the date captured by `en_date_tag`,
+                   e.g. 'May 3, 2021'.
+
+    Returns:
+        A datetime instance of the date.
+
+    Raises:
+        ValueError: The date is not valid.
+    """
+    month, day, year = tag.split(' ')
+    if month not in months_en:
+        raise ValueError(f'unknown month name in date tag: {tag}')
+    return datetime(int(year), months_en[month], int(day.rstrip(',')))
+
+
+def parse_date_tag_ko(tag: str) -> datetime:
+    """Parses the date of a Korean date tag without datetime.strptime().
+
+    Args:
+        tag (str): A string of the date captured by `ko_date_tag`,
+                   e.g. '2021년 5월 3일'.
+
+    Returns:
+        A datetime instance of the date.
+
+    Raises:
+        ValueError: The date is not valid.
+    """
+    year, month, day = tag.split(' ')
+    return datetime(int(year[:-1]), int(month[:-1]), int(day[:-1]))
+
+
+# date tag parser by locale, see parse_date_tag_en and parse_date_tag_ko
+date_tag_parser = {
+    'en': parse_date_tag_en,
+    'ko': parse_date_tag_ko
+}
+
+# message line splitter by locale, see split_message_en and split_message_ko
+message_splitter = {
+    'en': split_message_en,
+    'ko': split_message_ko
+}
+
+
+def read_metadata(f) -> tuple:
+    """Reads the metadata at the top of the chat log.
+
+    Reads up to the empty line before the chat log starts, leaving the file
+    positioned at the first line of the chat log.
+
+    Args:
+        f: A file object of the chat log opened in text mode.
+
+    Returns:
+        A tuple of (locale, title, date saved). Date saved will be None if
+        it is not found in the metadata.
+
+    Raises:
+        ValueError: The locale of the chat log is not supported.
+    """
+    lc = None
+    title = None
+    date_saved = None
+
+    # Compare first line with metadata_1
+    metadata_1 = f.readline()
+
+    # Determine chat locale
+    for l in locales:
+        if locale_keyword[l] not in metadata_1:
+            continue
+        match_title = match[l]['metadata'][1].match(metadata_1)
+        if match_title is not None:
+            # Locale match found, set it as the current locale
+            lc = l
+            log.info('locale set to %s', lc)
+            title = match_title.group(1)
+            break
+    
+    if lc is None:
+        raise ValueError('locale not supported or format not recognized')
+
+    # Parse metadata_2
+    metadata_2 = f.readline()
+
+    match_date_saved = match[lc]['metadata'][2].match(metadata_2)
+    log.debug('pattern=%s, str=%s', match[lc]['metadata'][2].pattern, metadata_2)
+    if match_date_saved is not None:
+        # The timestamp is in ISO 8601 format, which fromisoformat() parses
+        # without going through the format string of strptime()
+        date_saved = datetime.fromisoformat(match_date_saved.group(1))
+
+    f.readline() # skip empty new line before the chat log starts
+
+    return lc, title, date_saved
+
+
+def iter_chat(f, lc: str):
+    """Parses the chat log line by line and yields its contents in order.
+
+    Nothing is kept other than the last message, so a caller only counting
+    the contents doesn't need to hold the whole chat in memory. A message is
+    held back until the next message, date tag or event, or the end of the
+    file, so that it is yielded with its continuation lines already joined.
+    Unmatched lines following a date tag or an event continue no message and
+    are skipped.
+
+    Args:
+        f: A file object of the chat log, positioned after the metadata.
+        lc (str): A string of the locale of the chat log.
+
+    Yields:
+        A datetime instance for each date tag, a kakaotalk.Message instance
+        for each message and a kakaotalk.Event instance for each event.
+    """
+
+    end_ymd = None  # (year, month, day) of the last date tag
+
+    # Temporary variable to hold re.match() results
+    matches = None
+
+    # Bind locale specific values and methods to locals once, as
+    # local lookups are cheaper than the subscripts in the loop
+    split_message = message_splitter[lc]
+    message_re = match[lc]['message']
+    date_tag_re = match[lc]['date_tag']
+    event_res = tuple(
+        (event_type, event_re, event_keyword[lc][event_type])
+        for event_type, event_re in match[lc]['event'].items())
+    rich_content_literals = rich_content_literal[lc]
+    rich_content_re = match[lc]['rich_content_combined']
+    rich_content_prefixes = rich_content_prefix[lc]
+    hour_index = locale_time_format[lc]['hour']
+    minute_index = locale_time_format[lc]['minute']
+    ampm_index = locale_time_format[lc]['ampm']
+    pm = locale_pm[lc]
+    parse_date_tag = date_tag_parser[lc]
+    duration_types = rich_content_regex_duration_types
+    intern = sys.intern
+
+    # Last message, not yielded yet, and the lines that continue it, joined
+    # and appended at once when the message ends. Set to None once yielded,
+    # so that no line is appended to a message that was already counted
+    last_message = None
+    continuation = []
+
+    def finish(message):
+        # Append the queued continuation lines to the message ending here
+        if continuation:
+            message.append('\n'.join(continuation))
+            continuation.clear()
+        return message
+
+    # Read the whole file
+    for line in f:
+
+        # First character of the line, used to skip patterns that
+        # cannot match before running the regex engine
+        first = line[:1]
+
+        # 1. Message match
+        fields = None
+        if first == '[':
+            fields = split_message(line)
+            if fields is None:
+                # Fall back to the regex for lines the splitter rejects
+                matches = message_re.match(line)
+                if matches is not None:
+                    fields = matches.group(
+                        1, ampm_index, hour_index, minute_index, 5)
+
+        if fields is not None:
+            author, ampm, hour, minute, content = fields
+
+            # Share a single string object for each participant name
+            author = intern(author)
+
+            # Calculate datetime
+            time = None
+            if end_ymd is not None:
+                # (original hour) + (0 or 12 hour depending on the indicator)
+                # with 12 counted as 0, so 12AM is 0 and 12PM is 12
+                hour = int(hour) % 12
+                if ampm == pm:
+                    hour += 12
+                minute = int(minute)
+                # datetime object of the current date tag with the hour
+                # and minute, built directly from the cached date
+                time = datetime(end_ymd[0], end_ymd[1], end_ymd[2],
+                                hour, minute)
+
+            # Check whether the message contains rich content
+            rich_content_duration = None
+            rc_matches = None
+
+            # Check rich contents that don't need regex (most frequent)
+            rich_content_type = rich_content_literals.get(content)
+
+            # Check rich contents that needs regex with a single
+            # combined pattern (less frequent), only when the content
+            # starts like one of them
+            if rich_content_type is None \
+                    and content.startswith(rich_content_prefixes):
+                rc_matches = rich_content_re.fullmatch(content)
+            if rc_matches is not None:
+                rich_content_type = intern(rc_matches.lastgroup)
+
+                if rich_content_type in duration_types:
+                    # Groups following the named group are the
+                    # duration fields, (m, s, None) or (h, m, s)
+                    rich_content_duration = 0
+                    for value in rc_matches.groups()[rc_matches.lastindex:]:
+                        if value is not None:
+                            rich_content_duration = rich_content_duration * 60\
+                                                    + int(value)
+            
+            if rich_content_type is not None:
+                log.info('Rich content found: type=%s', rich_content_type)
+            if rich_content_duration is not None:
+                log.info('Rich content duration found: duration=%s',
+                         rich_content_duration)
+
+            # The previous message ends here
+            if last_message is not None:
+                yield finish(last_message)
+
+            # Create Message instance, yielded once it ends
+            last_message = Message(
+                time,
+                author,
+                content,
+                rich_content_type,
+                rich_content_duration
+            )
+            continue
+        
+        # 2. Date tag match
+        # group(1) is not optional, so a match always captures it
+        matches = date_tag_re.match(line) if first == '-' else None
+        if matches is not None:
+            date = parse_date_tag(matches.group(1))
+
+            # The last message of the previous day ends here
+            if last_message is not None:
+                yield finish(last_message)
+                last_message = None
+
+            # Update the date in order to set message dates
+            end_ymd = (date.year, date.month, date.day)
+            yield date
+            continue
+        
+        # 3. Event match
+        is_event = False
+
+        # Blank lines are never events, names may start with any character
+        if first != '\n':
+            for event_type, event_re, keyword in event_res:
+                if keyword in line and event_re.match(line) is not None:
+                    # The last message ends here
+                    if last_message is not None:
+                        yield finish(last_message)
+                        last_message = None
+
+                    # Create Event instance
+                    yield Event(event_type, line)
+                    is_event = True
+                    log.info('Event found: type=%s', event_type)
+                    break
+        
+        # 4. Multi-line message match
+        if is_event is False and last_message is not None:
+            # Queue the line to be appended to the last message, without
+            # the line break like the first line of the message
+            continuation.append(line.rstrip('\n'))
+
+    if last_message is not None:
+        yield finish(last_message)
+
+
+def stream(file_name: str):
+    """Parses the chat log and yields its contents without a Chatroom.
+
+    Args:
+        file_name (str): A string of file name to parse from.
+
+    Yields:
+        The date tags, messages and events of the chat log, see iter_chat().
+
+    Raises:
+        IOError: An error occurred reading the file.
+        ValueError: An error occurred parsing the file.
+    """
+    with open(file_name, 'r', encoding='UTF-8', buffering=read_buffer_size) as f:
+        lc, _, _ = read_metadata(f)
+        yield from iter_chat(f, lc)
+
+
+def _cache_signature(file_name: str) -> tuple:
+    """Returns the signature a cached result of the file has to match."""
+    stat = os.stat(file_name)
+    return (cache_version, stat.st_mtime_ns, stat.st_size)
+
+
+def load_cache(file_name: str):
+    """Loads the cached kakaotalk.Chatroom instance of the chat log.
+
+    Args:
+        file_name (str): A string of file name of the chat log.
+
+    Returns:
+        A kakaotalk.Chatroom instance if a cache of the current version of the
+        file exists, None otherwise.
+    """
+    try:
+        with open(file_name + cache_suffix, 'rb') as f:
+            signature, chatroom = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        log.warning('cannot read the cache of %s', file_name, exc_info=True)
+        return None
+
+    if signature != _cache_signature(file_name):
+        log.info('cache of %s is outdated', file_name)
+        return None
+
+    return chatroom
+
+
+def save_cache(file_name: str, chatroom: Chatroom) -> None:
+    """Saves the kakaotalk.Chatroom instance of the chat log next to it.
+
+    Args:
+        file_name (str): A string of file name of the chat log.
+        chatroom (Chatroom): A kakaotalk.Chatroom instance parsed from the file.
+    """
+    try:
+        with open(file_name + cache_suffix, 'wb') as f:
+            pickle.dump((_cache_signature(file_name), chatroom), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        log.warning('cannot write the cache of %s', file_name, exc_info=True)
+
+
+def parse(file_name: str, cache: bool = False):
     """Parses the chat log and returns a kakaotalk.Chatroom instance.
 
     Args:
         file_name (str): A string of file name to parse from. Should be located\
                          in the same directory as the executable.
+        cache (bool): Whether to reuse and store the result in a pickle next
+                      to the chat log, see load_cache(). Only enable this for
+                      directories you trust, as the pickle is loaded as is.
 
     Returns:
         A kakaotalk.Chatroom instance with the corresponding values.
@@ -315,10 +806,11 @@ def parse(file_name: str):
         ValueError: An error occurred parsing the file.
     """
 
-    title = None
-    date_saved = None
-    start_date = None
-    end_date = None
+    if cache:
+        chatroom = load_cache(file_name)
+        if chatroom is not None:
+            log.info('loaded %s from cache', file_name)
+            return chatroom
 
     chatroom = None
 
@@ -326,160 +818,31 @@ def parse(file_name: str):
     lc = None
 
     # Read from file
-    with open(file_name, 'r', encoding='UTF-8') as f:
+    with open(file_name, 'r', encoding='UTF-8', buffering=read_buffer_size) as f:
         try:
-            # Compare first line with metadata_1
-            metadata_1 = f.readline()
-
-            # Determine chat locale
-            for l in locales:
-                match_title = re.match(match[l]['metadata'][1], metadata_1)
-                if match_title is not None:
-                    # Locale match found, set it as the current locale
-                    lc = l
-                    log.info(f'locale set to {lc}')
-                    title = match_title.group(1)
-                    break
-            
-            if lc is None:
-                raise ValueError('locale not supported or format not recognized')
-
-            # Parse metadata_2
-            metadata_2 = f.readline()
-
-            match_date_saved = re.match(match[lc]['metadata'][2], metadata_2)
-            log.debug(f"pattern={match[lc]['metadata'][2]}, str={metadata_2}")
-            if match_date_saved is not None:
-                date_saved = datetime.strptime(
-                    match_date_saved.group(1), 
-                    '%Y-%m-%d %H:%M:%S')
-            
+            lc, title, date_saved = read_metadata(f)
+
             # Initialize Chatroom instance
             chatroom = Chatroom(title, date_saved)
-
-            f.readline() # skip empty new line before the chat log starts
         
         except ValueError as err:
             log.error(err)
-        except:
-            log.error('cannot read the metadata of the file')
-            traceback.print_exc()
+        except Exception:
+            log.exception('cannot read the metadata of the file')
         
         try:
             if chatroom is None:
                 raise ValueError('kakaotalk.Chatroom is not initialized')
-            
-            # Temporary variable to hold re.match() results
-            matches = None
-
-            # Read the whole file
-            for line in f:
-
-                # 1. Message match
-                matches = re.match(match[lc]['message'], line)
-                if matches is not None and matches.group(1) is not None:
-
-                    # Calculate datetime
-                    time = None
-                    if end_date is not None:
-                        # (original hour) + (0 or 12 hour depending on the indicator)
-                        hour = int(matches.group(locale_time_format[lc]['hour']))\
-                               + locale_hours[lc][matches.group(
-                                   locale_time_format[lc]['ampm'])]
-                        if hour > 23:
-                            hour -= 12  # prevent 12PM translating to 24
-                        minute = int(matches.group(locale_time_format[lc]['minute']))
-                        # datetime object with updated hour and minute
-                        time = end_date.replace(hour=hour, minute=minute)
-
-                    # Check whether the message contains rich content
-                    rich_content_type = None
-                    rich_content_duration = None
-                    rc_matches = None
-
-                    # Check rich contents that don't need regex (most frequent)
-                    for rc_type in rich_content_types:
-                        if matches.group(5) == match[lc]['rich_content'][rc_type]:
-                            rich_content_type = rc_type
-                            break
-
-                    if rich_content_type is None:
-                        # Check rich contents that needs regex (less frequent)
-                        for rc_type in rich_content_regex_types:
-                            rc_matches = re.match(match[lc]['rich_content'][rc_type], matches.group(5))
-
-                            if rc_matches is not None and rc_matches.group(1) is not None:
-                                rich_content_type = rc_type
-                                break
-                    
-                    if rich_content_type is None:
-                        # Check rich contents that needs regex and has duration (least frequent)
-                        for rc_type in rich_content_regex_duraton_types:
-                            rc_matches = re.match(match[lc]['rich_content'][rc_type], matches.group(5))
-                            if rc_matches is not None and rc_matches.group(1) is not None:
-                                rich_content_type = rc_type
-
-                                # Duration is shorter than 1 hour
-                                if 'hr' not in rc_type:
-                                    rich_content_duration = int(rc_matches.group(1)) * 60\
-                                                            + int(rc_matches.group(2))
-                                # Duration is longer than 1 hour
-                                else:
-                                    rich_content_duration = int(rc_matches.group(1)) * 60 * 60\
-                                                            + int(rc_matches.group(2)) * 60\
-                                                            + int(rc_matches.group(3))
-                    
-                    if rich_content_type is not None:
-                        log.info(f'Rich content found: type={rich_content_type}')
-                    if rich_content_duration is not None:
-                        log.info(f'Rich content duration found: duration={rich_content_duration}')
-
-                    # Create Message instance and add to Chatroom
-                    chatroom.add_message(Message(
-                        time,
-                        matches.group(1),  # author
-                        matches.group(5),  # content 
-                        rich_content_type,
-                        rich_content_duration
-                    ))
-                    continue
-                
-                # 2. Date tag match
-                matches = re.match(match[lc]['date_tag'], line)
-                if matches is not None and matches.group(1) is not None:
-                    date = datetime.strptime(matches.group(1), date_tag_format[lc])
-
-                    # Update start_date on first date tag
-                    if start_date is None:
-                        start_date = date
-                        chatroom.set_start_date(date)
-                    
-                    # Update end_date in order to set message dates
-                    end_date = date
-                    chatroom.set_end_date(date)
-                    continue
-                
-                # 3. Event match
-                is_event = False
-
-                for event_type in ['invite', 'leave']:
-                    matches = re.match(match[lc]['event'][event_type], line)
-                    if matches is not None and matches.group(1) is not None:
-                        # Create Event instance and add to Chatroom
-                        chatroom.add_event(Event(event_type, line))
-                        is_event = True
-                        log.info(f'Event found: type={event_type}')
-                        break
-                
-                # 4. Multi-line message match
-                if is_event is False and len(chatroom.messages) > 0:
-                    # Append the line to the last message instance
-                    chatroom.messages[-1].append(line)
+
+            chatroom.add_stream(iter_chat(f, lc))
+
+            # Only cache chat logs that were parsed without an error
+            if cache:
+                save_cache(file_name, chatroom)
                         
         except ValueError as err:
             log.error(err)
-        except:
-            log.error('cannot parse the given chat log')
-            traceback.print_exc()
+        except Exception:
+            log.exception('cannot parse the given chat log')
     
         return chatroom
@@ -0,0 +1,118 @@
+"""Profiles kakaotalk_parser.parse() on a synthetic chat log.
+
+Generates the synthetic chat log described in docs/performance.md with a
+fixed random seed, times the parse and prints the functions taking the most
+time under cProfile. Run from the repository root as a module, so that this
+file doesn't shadow the `profile` module of the standard library.
+
+  Typical usage example:
+
+  python -m tools.profile
+  python -m tools.profile 100000
+"""
+
+
+import os
+import sys
+import time
+import random
+import cProfile
+import pstats
+import tempfile
+import logging as log
+from datetime import date, timedelta
+
+import kakaotalk_parser
+
+
+names = ['Alice', 'Bob', 'Charlie', 'Dana', 'Eve']
+
+rich_contents = [
+    'Photo', 'Emoticons', 'videos', 'https://youtu.be/abc',
+    'https://example.com/x', 'File: a.pdf', 'Voice Call 12:34',
+    'This message was deleted.'
+]
+
+words = 'hello there how are you doing today lol ok sure thing see you later'\
+        .split()
+
+
+def generate(file_name: str, message_count: int, seed: int = 0) -> None:
+    """Writes an English chat log of at least the given number of messages.
+
+    Messages are written a day at a time, so the last day may exceed the
+    given count by up to 199 messages.
+
+    Args:
+        file_name (str): A string of file name to write to.
+        message_count (int): Minimum number of messages to write.
+        seed (int): Seed of the random generator, the same seed and count
+                    always write the same chat log.
+    """
+
+    rng = random.Random(seed)
+    day = date(2018, 1, 1)
+    count = 0
+
+    with open(file_name, 'w', encoding='UTF-8') as f:
+        f.write('Friends with KakaoTalk Chats\n'
+                'Date Saved : 2021-05-20 13:04:11\n\n')
+
+        while count < message_count:
+            f.write('--------------- {}, {} {}, {} ---------------\n'.format(
+                day.strftime('%A'), day.strftime('%B'), day.day, day.year))
+
+            for _ in range(rng.randint(20, 200)):
+                hour = rng.randint(1, 12)
+                minute = rng.randint(0, 59)
+                if rng.random() < 0.2:
+                    content = rng.choice(rich_contents)
+                else:
+                    content = ' '.join(rng.choices(words, k=rng.randint(1, 12)))
+                f.write('[{}] [{}:{:02d} {}M] {}\n'.format(
+                    rng.choice(names), hour, minute, rng.choice('AP'), content))
+                if rng.random() < 0.05:
+                    f.write('continued line here\n')
+                count += 1
+
+            day += timedelta(1)
+
+
+def main(message_count: int = 500000) -> None:
+    """Generates the synthetic chat log, then times and profiles the parse.
+
+    Args:
+        message_count (int): Minimum number of messages of the chat log.
+    """
+
+    # Logging the rich contents of every message would dominate the profile
+    log.disable(log.CRITICAL)
+
+    fd, file_name = tempfile.mkstemp(suffix='.txt')
+    os.close(fd)
+
+    try:
+        generate(file_name, message_count)
+
+        # Best of 3 runs
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            chatroom = kakaotalk_parser.parse(file_name)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+
+        print('{} messages parsed in {:.2f}s'.format(
+            chatroom.message_count, best))
+
+        profiler = cProfile.Profile()
+        profiler.runcall(kakaotalk_parser.parse, file_name)
+        pstats.Stats(profiler).sort_stats('tottime').print_stats(15)
+
+    finally:
+        os.remove(file_name)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))